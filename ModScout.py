@@ -11,16 +11,22 @@ import os
 import re
 import sys
 import sysconfig
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType, ModuleType
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-SYSTEM_MODULES = {
+try:  # optional: only used to write the JSON report faster
+    import orjson
+except ImportError:
+    orjson = None
+
+SYSTEM_MODULES = frozenset({
     "os", "sys", "subprocess", "ctypes", "multiprocessing", "pathlib", "socket",
     "ssl", "http", "ftplib", "telnetlib", "select", "selectors", "shutil",
     "signal", "resource", "fcntl", "pty", "platform", "shlex", "winreg", "uuid",
     "tempfile", "atexit", "importlib",
-}
+})
 
-SYSTEM_CALLABLES = {
+SYSTEM_CALLABLES = frozenset({
     "system", "popen", "Popen", "run", "call", "check_call", "check_output",
     "spawn", "spawnl", "spawnle", "spawnlp", "spawnlpe",
     "spawnv", "spawnve", "spawnvp", "spawnvpe",
@@ -28,7 +34,7 @@ SYSTEM_CALLABLES = {
     "fork", "forkpty",
     "open", "unlink", "remove", "rmdir", "rmtree", "mkfifo", "mknod",
     "chmod", "chown",
-}
+})
 
 DEFAULT_CONFIG = {
     "roots": ["random"],
@@ -51,6 +57,15 @@ DEFAULT_CONFIG = {
     }
 }
 
+_MISSING = object()
+_UTC = datetime.timezone.utc
+
+try:
+    _STDLIB_PREFIX: Optional[str] = os.path.abspath(sysconfig.get_paths()["stdlib"])
+except Exception:
+    _STDLIB_PREFIX = None
+
+
 def is_builtin_module(mod: Any) -> bool:
     try:
         name = mod.__name__
@@ -69,38 +84,16 @@ def is_stdlib_module(mod: Any) -> bool:
     origin = getattr(spec, "origin", None)
     if origin == "built-in":
         return True
-    if not isinstance(origin, str):
-        return False
-    try:
-        stdlib = sysconfig.get_paths()["stdlib"]
-    except Exception:
+    if not isinstance(origin, str) or _STDLIB_PREFIX is None:
         return False
     try:
-        return os.path.abspath(origin).startswith(os.path.abspath(stdlib))
+        return os.path.abspath(origin).startswith(_STDLIB_PREFIX)
     except Exception:
         return False
 
 
-def iter_attr_names(obj: Any, use_dir: bool = True) -> List[str]:
-    names = set()
-    d = getattr(obj, "__dict__", None)
-    if isinstance(d, dict):
-        names.update(d.keys())
-    elif d is not None:
-        try:
-            names.update(d.keys())
-        except Exception:
-            pass
-    if use_dir:
-        try:
-            for n in dir(obj):
-                names.add(n)
-        except Exception:
-            pass
-    return list(names)
-
-
-_MISSING = object()
+# Module and instance __dict__s are dicts; class __dict__s are mappingproxies.
+_NAMESPACE_TYPES = (dict, MappingProxyType)
 
 
 class SafeGetAttr:
@@ -109,14 +102,10 @@ class SafeGetAttr:
 
     def get(self, obj: Any, name: str) -> Any:
         d = getattr(obj, "__dict__", None)
-        if isinstance(d, dict) and name in d:
-            return d[name]
-        if d is not None:
-            try:
-                if name in d.keys():
-                    return d[name]
-            except Exception:
-                pass
+        if isinstance(d, _NAMESPACE_TYPES):
+            v = d.get(name, _MISSING)
+            if v is not _MISSING:
+                return v
         if not self.risk:
             return _MISSING
         try:
@@ -126,11 +115,13 @@ class SafeGetAttr:
 
 
 def is_traversable(child: Any,
+                   is_mod: bool,
+                   is_cls: bool,
                    follow_classes: bool = True,
                    follow_instances: bool = False) -> bool:
-    if inspect.ismodule(child):
+    if is_mod:
         return True
-    if follow_classes and inspect.isclass(child):
+    if follow_classes and is_cls:
         return True
     if follow_instances:
         if isinstance(child, (str, bytes, bytearray, memoryview, int, float, complex, bool)):
@@ -139,10 +130,6 @@ def is_traversable(child: Any,
     return False
 
 
-def qual_from_path(path: List[str]) -> str:
-    return ".".join(path)
-
-
 def describe_object(obj: Any) -> Dict[str, Any]:
     try:
         mod = getattr(obj, "__module__", None)
@@ -156,11 +143,12 @@ def describe_object(obj: Any) -> Dict[str, Any]:
         name = getattr(obj, "__name__", None)
     except Exception:
         name = None
-    spec = getattr(obj, "__spec__", None) if inspect.ismodule(obj) else None
+    is_mod = inspect.ismodule(obj)
+    spec = getattr(obj, "__spec__", None) if is_mod else None
     origin = getattr(spec, "origin", None) if spec else None
-    file = getattr(obj, "__file__", None) if inspect.ismodule(obj) else None
+    file = getattr(obj, "__file__", None) if is_mod else None
     return {
-        "type": "module" if inspect.ismodule(obj) else type(obj).__name__,
+        "type": "module" if is_mod else type(obj).__name__,
         "module": mod,
         "qualname": qn,
         "name": name,
@@ -169,83 +157,227 @@ def describe_object(obj: Any) -> Dict[str, Any]:
     }
 
 
-def match_rules(child: Any,
-                name: str,
-                path: List[str],
-                rules: List[Dict[str, Any]],
-                categories: Optional[Dict[str, Dict[str, List[str]]]] = None) -> List[Dict[str, Any]]:
-    categories = categories or {}
-    qpath = qual_from_path(path)
-    hits: List[Dict[str, Any]] = []
+class Finding:
+    """A rule hit. The object is only described when ``to_dict()`` is called
+    for a finding that is actually printed or written out."""
 
-    for rule in rules:
-        kind = rule.get("type") or rule.get("kind")
-        pat = rule.get("pattern") or rule.get("value")
+    __slots__ = ("path", "name", "depth", "match", "object")
+
+    def __init__(self, path: str, name: str, depth: int, match: Dict[str, Any], obj: Any) -> None:
+        self.path = path
+        self.name = name
+        self.depth = depth
+        self.match = match
+        self.object = obj
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "name": self.name,
+            "depth": self.depth,
+            "match": self.match,
+            "object": describe_object(self.object),
+        }
+
+
+Predicate = Callable[[Any, str, Optional[str], bool, bool], Optional[str]]
+
+# Rule kinds whose predicate looks at the dotted path.
+_QPATH_KINDS = frozenset({"qualname", "qualname_regex"})
+# Rule kinds that can only match modules / only callables.
+_MODULE_KINDS = frozenset({"module_name", "module_startswith", "builtin_module", "stdlib_module"})
+_CALLABLE_KINDS = frozenset({"callable_name"})
+
+
+def _rule_applies(kind: str, rule: Dict[str, Any], is_mod: bool, is_callable: bool) -> bool:
+    if kind in _MODULE_KINDS:
+        return is_mod
+    if kind in _CALLABLE_KINDS:
+        return is_callable
+    if kind == "category":
+        cat = rule.get("category")
+        if cat == "system":
+            return is_mod or is_callable
+        if cat == "builtin":
+            return is_mod
+    return True
+
+
+def _depends_only_on_object(kind: str, rule: Dict[str, Any], is_callable: bool) -> bool:
+    # True when the outcome ignores the attribute name and path, so one
+    # evaluation per object is enough however many routes lead to it.
+    if kind in _MODULE_KINDS:
+        return True
+    if kind == "category":
         cat = rule.get("category")
-        reason = None
+        if cat == "system":
+            return not is_callable
+        return cat == "builtin"
+    return False
 
-        if kind == "module_name":
-            if inspect.ismodule(child) and getattr(child, "__name__", None) == pat:
-                reason = f"module_name == {pat}"
 
-        elif kind == "module_startswith":
-            if inspect.ismodule(child):
+class RuleSet:
+    """Rules compiled once into ``(kind, rule, predicate)`` entries.
+
+    Each predicate takes ``(child, name, qpath, is_mod, is_callable)`` and
+    returns the match reason, or ``None``. ``qpath`` may be ``None`` unless
+    ``needs_qpath`` is set.
+
+    ``buckets[2 * is_mod + is_callable]`` holds, in rule order, only the
+    entries that can match an object with those flags, as
+    ``(index, kind, rule, predicate, by_object)``; ``by_object`` marks rules
+    whose outcome depends on the object alone.
+    """
+
+    def __init__(self, entries: List[Tuple[str, Dict[str, Any], Predicate]]) -> None:
+        self.entries = entries
+        self.needs_qpath = any(kind in _QPATH_KINDS for kind, _, _ in entries)
+        self.buckets = tuple(
+            [(i, kind, rule, pred, _depends_only_on_object(kind, rule, is_callable))
+             for i, (kind, rule, pred) in enumerate(entries)
+             if _rule_applies(kind, rule, is_mod, is_callable)]
+            for is_mod in (False, True)
+            for is_callable in (False, True)
+        )
+
+
+def _compile_rule(rule: Dict[str, Any],
+                  categories: Dict[str, Dict[str, List[str]]]) -> Optional[Predicate]:
+    kind = rule.get("type") or rule.get("kind")
+    pat = rule.get("pattern") or rule.get("value")
+    cat = rule.get("category")
+
+    if kind == "module_name":
+        reason = f"module_name == {pat}"
+
+        def pred(child, name, qpath, is_mod, is_callable):
+            if is_mod and getattr(child, "__name__", None) == pat:
+                return reason
+            return None
+        return pred
+
+    if kind == "module_startswith":
+        if not isinstance(pat, str):
+            raise ValueError(f"{kind} rule needs a string pattern, got {pat!r}")
+        reason = f"module startswith {pat}"
+
+        def pred(child, name, qpath, is_mod, is_callable):
+            if is_mod:
                 n = getattr(child, "__name__", None)
                 if isinstance(n, str) and n.startswith(pat):
-                    reason = f"module startswith {pat}"
-
-        elif kind == "qualname":
-            if qpath == pat:
-                reason = f"path == {pat}"
-
-        elif kind == "qualname_regex":
-            try:
-                if re.search(pat, qpath):
-                    reason = f"path matches /{pat}/"
-            except re.error:
-                pass
-
-        elif kind == "callable_name":
-            if callable(child) and name == pat:
-                reason = f"callable name == {pat}"
-
-        elif kind == "attr_name":
-            if name == pat:
-                reason = f"attr name == {pat}"
-
-        elif kind == "builtin_module":
-            if inspect.ismodule(child) and is_builtin_module(child):
-                reason = "builtin module"
-
-        elif kind == "stdlib_module":
-            if inspect.ismodule(child) and is_stdlib_module(child):
-                reason = "stdlib module"
-
-        elif kind == "category":
-            modules = set(categories.get(cat, {}).get("modules", []))
-            callables = set(categories.get(cat, {}).get("callables", []))
+                    return reason
+            return None
+        return pred
+
+    if kind == "qualname":
+        reason = f"path == {pat}"
+
+        def pred(child, name, qpath, is_mod, is_callable):
+            return reason if qpath == pat else None
+        return pred
+
+    if kind == "qualname_regex":
+        if not isinstance(pat, str):
+            raise ValueError(f"{kind} rule needs a string pattern, got {pat!r}")
+        try:
+            search = re.compile(pat).search
+        except re.error as e:
+            raise ValueError(f"Invalid qualname_regex pattern {pat!r}: {e}") from e
+        reason = f"path matches /{pat}/"
+
+        def pred(child, name, qpath, is_mod, is_callable):
+            return reason if search(qpath) else None
+        return pred
+
+    if kind == "callable_name":
+        reason = f"callable name == {pat}"
+
+        def pred(child, name, qpath, is_mod, is_callable):
+            return reason if is_callable and name == pat else None
+        return pred
+
+    if kind == "attr_name":
+        reason = f"attr name == {pat}"
+
+        def pred(child, name, qpath, is_mod, is_callable):
+            return reason if name == pat else None
+        return pred
+
+    if kind == "builtin_module":
+        def pred(child, name, qpath, is_mod, is_callable):
+            return "builtin module" if is_mod and is_builtin_module(child) else None
+        return pred
+
+    if kind == "stdlib_module":
+        def pred(child, name, qpath, is_mod, is_callable):
+            return "stdlib module" if is_mod and is_stdlib_module(child) else None
+        return pred
+
+    if kind == "category":
+        reason = f"category:{cat}"
+        if cat == "system":
+            spec = categories.get(cat, {})
+            modules = frozenset(spec.get("modules", []))
+            callables = frozenset(spec.get("callables", []))
             if not modules and not callables:
-                if cat == "system":
-                    modules, callables = SYSTEM_MODULES, SYSTEM_CALLABLES
-                elif cat == "builtin":
-                    modules, callables = set(), set()
-
-            if cat == "system":
-                if (inspect.ismodule(child) and getattr(child, "__name__", None) in modules) or \
-                   (callable(child) and name in callables):
-                    reason = f"category:{cat}"
-            elif cat == "builtin":
-                if inspect.ismodule(child) and is_builtin_module(child):
-                    reason = f"category:{cat}"
+                modules, callables = SYSTEM_MODULES, SYSTEM_CALLABLES
+
+            def pred(child, name, qpath, is_mod, is_callable):
+                if (is_mod and getattr(child, "__name__", None) in modules) or \
+                   (is_callable and name in callables):
+                    return reason
+                return None
+            return pred
+
+        if cat == "builtin":
+            def pred(child, name, qpath, is_mod, is_callable):
+                return reason if is_mod and is_builtin_module(child) else None
+            return pred
+
+    return None
 
+
+def compile_rules(rules: List[Dict[str, Any]],
+                  categories: Optional[Dict[str, Dict[str, List[str]]]] = None) -> RuleSet:
+    """Compile rule dicts into a RuleSet; raises ValueError on a bad pattern."""
+    categories = categories or {}
+    entries = []
+    for rule in rules:
+        pred = _compile_rule(rule, categories)
+        if pred is not None:
+            entries.append((rule.get("type") or rule.get("kind"), rule, pred))
+    return RuleSet(entries)
+
+
+def match_rules(child: Any,
+                name: str,
+                qpath: Optional[str],
+                is_mod: bool,
+                is_callable: bool,
+                rules: RuleSet,
+                matched: Optional[set] = None) -> List[Dict[str, Any]]:
+    """Return the hits of ``rules`` on ``child``.
+
+    If ``matched`` is given, object-only rules are evaluated at most once per
+    ``(id(child), rule index)``; the set is updated in place. Callers must
+    offer each object through its shortest route first (scan_roots walks
+    breadth-first), since that is the route that gets reported.
+    """
+    hits: List[Dict[str, Any]] = []
+    for i, kind, rule, pred, by_object in rules.buckets[2 * is_mod + is_callable]:
+        if by_object and matched is not None:
+            key = (id(child), i)
+            if key in matched:
+                continue
+            matched.add(key)
+        reason = pred(child, name, qpath, is_mod, is_callable)
         if reason:
             hits.append({"kind": kind, "reason": reason, "rule": rule})
-
     return hits
 
 
 def scan_roots(roots: List[str],
-               rules: List[Dict[str, Any]],
+               rules: Union[RuleSet, List[Dict[str, Any]]],
                *,
                max_depth: int = 5,
                max_objects: int = 50000,
@@ -254,82 +386,123 @@ def scan_roots(roots: List[str],
                follow_classes: bool = True,
                follow_instances: bool = False,
                exclude_module_prefixes: Optional[List[str]] = None,
-               categories: Optional[Dict[str, Dict[str, List[str]]]] = None) -> List[Dict[str, Any]]:
-    exclude_module_prefixes = exclude_module_prefixes or []
+               categories: Optional[Dict[str, Dict[str, List[str]]]] = None) -> List[Finding]:
+    exclude_module_prefixes = tuple(exclude_module_prefixes or ())
+    compiled = rules if isinstance(rules, RuleSet) else compile_rules(rules, categories)
+    needs_qpath = compiled.needs_qpath
     sg = SafeGetAttr(risk=risk_getattr)
     visited: set[int] = set()
     queue = collections.deque()
 
-    findings: List[Dict[str, Any]] = []
+    findings: List[Finding] = []
+    # (id(obj), rule index) pairs already evaluated, see match_rules(). The
+    # walk is breadth-first and roots are matched before it starts, so the
+    # route kept for an object is always one of its shallowest.
+    matched: set[Tuple[int, int]] = set()
     count = 0
 
+    root_ids: set[int] = set()
     for root in roots:
         try:
-            mod = importlib.import_module(root)
-            queue.append((mod, root, [root], 0))
+            mod = sys.modules.get(root) or importlib.import_module(root)
         except Exception as e:
             print(f"[WARN] Failed to import root {root}: {e}", file=sys.stderr)
-
+            continue
+        # A root listed twice (or under two names) is only matched and walked once.
+        if id(mod) in root_ids:
+            continue
+        root_ids.add(id(mod))
+        is_mod, is_call = isinstance(mod, ModuleType), callable(mod)
+        queue.append((mod, root, root, 0, is_mod, is_call))
+        modname = getattr(mod, "__name__", None) if is_mod else None
+        if modname and modname.startswith(exclude_module_prefixes):
+            continue
+        for hit in match_rules(mod, root, root, is_mod, is_call, compiled, matched):
+            findings.append(Finding(root, root, 0, hit, mod))
+
+    # Bind everything the loop touches per object/attribute to locals, so each
+    # use is a LOAD_FAST instead of a global, builtin or attribute lookup.
+    queue_popleft, queue_append = queue.popleft, queue.append
+    visited_add = visited.add
+    findings_append = findings.append
+    sg_get = sg.get
+    _id, _dir, _isinstance, _callable = id, dir, isinstance, callable
+    _ModuleType, missing = ModuleType, _MISSING
+    _match_rules, _is_traversable, _Finding = match_rules, is_traversable, Finding
+
+    # Breadth-first, so max_objects is shared fairly between roots and every
+    # object is first reached through its shortest route.
     while queue and count < max_objects:
-        obj, name, path, depth = queue.popleft()
-        oid = id(obj)
+        obj, name, qpath, depth, is_mod, is_call = queue_popleft()
+        oid = _id(obj)
         if oid in visited:
             continue
-        visited.add(oid)
+        visited_add(oid)
         count += 1
 
-        if inspect.ismodule(obj):
+        if is_mod:
             modname = getattr(obj, "__name__", None)
-            if modname and any(modname.startswith(pfx) for pfx in exclude_module_prefixes):
+            if modname and modname.startswith(exclude_module_prefixes):
                 continue
 
-        for hit in match_rules(obj, path[-1], path, rules, categories=categories):
-            findings.append({
-                "path": qual_from_path(path),
-                "name": path[-1],
-                "depth": depth,
-                "match": hit,
-                "object": describe_object(obj),
-            })
-
         if depth >= max_depth:
             continue
 
-        names = iter_attr_names(obj, use_dir=True)
+        # dir() can leave out namespace entries (a PEP 562 module __dir__, or a
+        # metaclass __dir__ such as Enum's), so merge the __dict__ keys back
+        # in, and fall back to them alone if dir() fails.
+        d = getattr(obj, "__dict__", None)
+        keys = [k for k in d if _isinstance(k, str)] if _isinstance(d, _NAMESPACE_TYPES) else []
+        try:
+            names = _dir(obj)
+        except Exception:
+            names = keys
+        else:
+            if keys:
+                listed = set(names)
+                names.extend([k for k in keys if k not in listed])
         if prune_dunders:
-            names = [n for n in names if not (n.startswith("__") and n.endswith("__"))]
+            # Single-character indexing avoids method calls and slice copies.
+            names = [n for n in names
+                     if not (len(n) > 1 and n[0] == "_" and n[1] == "_" and n[-1] == "_" and n[-2] == "_")]
 
         for n in names:
-            child = sg.get(obj, n)
-            if child is _MISSING:
+            child = sg_get(obj, n)
+            if child is missing:
                 continue
-            child_path = path + [n]
-
-            for hit in match_rules(child, n, child_path, rules, categories=categories):
-                findings.append({
-                    "path": qual_from_path(child_path),
-                    "name": n,
-                    "depth": depth + 1,
-                    "match": hit,
-                    "object": describe_object(child),
-                })
-
-            if is_traversable(child, follow_classes=follow_classes, follow_instances=follow_instances):
-                queue.append((child, n, child_path, depth + 1))
+            # Only build the dotted path up front if a rule looks at it.
+            child_qpath = qpath + "." + n if needs_qpath else None
+            child_is_mod = _isinstance(child, _ModuleType)
+            child_is_cls = _isinstance(child, type)
+            child_is_call = _callable(child)
+
+            hits = _match_rules(child, n, child_qpath, child_is_mod, child_is_call, compiled, matched)
+            if hits and child_qpath is None:
+                child_qpath = qpath + "." + n
+            for hit in hits:
+                findings_append(_Finding(child_qpath, n, depth + 1, hit, child))
+
+            if _is_traversable(child, child_is_mod, child_is_cls, follow_classes, follow_instances):
+                if child_qpath is None:
+                    child_qpath = qpath + "." + n
+                queue_append((child, n, child_qpath, depth + 1, child_is_mod, child_is_call))
 
     return findings
 
 
-def run_with_config(cfg: Dict[str, Any]):
+def run_with_config(cfg: Dict[str, Any], compiled: Optional[RuleSet] = None):
     roots = cfg.get("roots", [])
     rules = cfg.get("rules", [])
     scan = cfg.get("scan", {})
     out = cfg.get("output", {})
     categories = cfg.get("categories", {})
 
+    # Compiled up front so a bad rule fails before any module is imported.
+    if compiled is None:
+        compiled = compile_rules(rules, categories)
     findings = scan_roots(
         roots=roots,
-        rules=rules,
+        rules=compiled,
         max_depth=scan.get("max_depth", 5),
         max_objects=scan.get("max_objects", 50000),
         prune_dunders=scan.get("prune_dunders", True),
@@ -342,10 +515,38 @@ def run_with_config(cfg: Dict[str, Any]):
 
     summary = collections.defaultdict(int)
     for f in findings:
-        summary[f["match"]["reason"]] += 1
+        summary[f.match["reason"]] += 1
     return findings, summary
 
 
+def _dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def write_report(f: IO[str], header: Dict[str, Any], findings: Iterable[Finding]) -> int:
+    """Write ``header`` plus a trailing "findings" array to ``f``.
+
+    Findings are described and serialized one at a time instead of building
+    the whole payload first; the text is the same as json.dump(indent=2) of
+    the combined dict. Returns the number of findings written.
+    """
+    f.write("{\n")
+    for key, value in header.items():
+        f.write(f"  {_dumps(key)}: ")
+        f.write(_dumps(value).replace("\n", "\n  "))
+        f.write(",\n")
+    f.write('  "findings": [')
+    n = 0
+    for finding in findings:
+        f.write(",\n    " if n else "\n    ")
+        f.write(_dumps(finding.to_dict()).replace("\n", "\n    "))
+        n += 1
+    f.write("\n  ]\n}" if n else "]\n}")
+    return n
+
+
 def main(argv: Optional[List[str]] = None) -> int:
     p = argparse.ArgumentParser(
         description="Analyze Python module chains using dir() recursively and flag target modules/objects."
@@ -415,7 +616,14 @@ def main(argv: Optional[List[str]] = None) -> int:
     if args.limit is not None:
         cfg.setdefault("output", {})["limit"] = args.limit
 
-    findings, summary = run_with_config(cfg)
+    # Only config errors are reported here; errors raised while scanning
+    # third-party objects keep their traceback.
+    try:
+        compiled = compile_rules(cfg.get("rules", []), cfg.get("categories", {}))
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 2
+    findings, summary = run_with_config(cfg, compiled)
 
     print("=== Summary ===")
     print("Roots:", ", ".join(cfg.get("roots", [])))
@@ -424,7 +632,8 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     show_n = min(30, len(findings))
     print(f"\n=== First {show_n} findings ===")
-    for f in findings[:show_n]:
+    for finding in findings[:show_n]:
+        f = finding.to_dict()
         obj = f["object"]
         obj_loc = f"{obj['module']}.{obj['qualname'] or obj['name']}" if obj['module'] else (obj['qualname'] or obj['name'])
         print(f"[d={f['depth']}] {f['path']} :: {obj['type']} ({obj_loc})  -- {f['match']['reason']}")
@@ -432,19 +641,17 @@ def main(argv: Optional[List[str]] = None) -> int:
     out_path = cfg.get("output", {}).get("json_path")
     if out_path:
         limit = cfg.get("output", {}).get("limit", 0) or None
-        to_write = findings if limit is None else findings[:limit]
-        payload = {
-            "generated_at": datetime.datetime.utcnow().isoformat() + "Z",
+        header = {
+            "generated_at": datetime.datetime.now(_UTC).isoformat(timespec="seconds"),
             "roots": cfg.get("roots", []),
             "rules": cfg.get("rules", []),
             "scan": cfg.get("scan", {}),
             "summary": dict(summary),
             "total_matches": len(findings),
-            "findings": to_write,
         }
         with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2, ensure_ascii=False)
-        print(f"\nSaved JSON report to {out_path}  (items written: {len(to_write)}/{len(findings)})")
+            written = write_report(f, header, findings if limit is None else findings[:limit])
+        print(f"\nSaved JSON report to {out_path}  (items written: {written}/{len(findings)})")
     return 0
 
 